@@ -11,23 +11,35 @@ Open:   http://localhost:8765
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
+import multiprocessing
 import os
 import sys
+import threading
 import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Any
+from types import MappingProxyType
+from typing import Any, Callable, Mapping
 
+import orjson
+import simdjson
 import uvicorn
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import HTMLResponse, JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler, FileModifiedEvent
 
+try:
+    # Linux only: lets the file watch run inside the asyncio loop
+    from asyncinotify import Inotify, Mask
+except ImportError:
+    Inotify = None
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Configuration
 # ─────────────────────────────────────────────────────────────────────────────
@@ -41,6 +53,14 @@ HOST        = os.environ.get("TPF2_HOST", "127.0.0.1")
 PORT        = int(os.environ.get("TPF2_PORT", "8765"))
 LOG_LEVEL   = os.environ.get("TPF2_LOG_LEVEL", "info")
 WS_MAX_SIZE = int(os.environ.get("TPF2_WS_MAX_SIZE", "0"))  # 0 = unlimited
+# "auto" picks uvloop / httptools whenever they are installed (uvicorn[standard])
+LOOP        = os.environ.get("TPF2_LOOP", "auto")
+HTTP        = os.environ.get("TPF2_HTTP", "auto")
+# Each worker process watches telemetry.json on its own, so the file itself
+# acts as the broadcast bus between workers.
+WORKERS     = int(os.environ.get("TPF2_WORKERS", "1"))
+# Processes that validate and encode snapshots (0 = parse in the server process)
+PARSE_WORKERS = int(os.environ.get("TPF2_PARSE_WORKERS", "1"))
 
 # Override path via argument or env var
 if len(sys.argv) > 1:
@@ -62,135 +82,384 @@ logging.basicConfig(
 log = logging.getLogger("tpf2-telemetry")
 
 # ─────────────────────────────────────────────────────────────────────────────
-# Data store (in-memory, thread-safe via asyncio.Lock)
+# Summary extraction (simdjson, on demand)
+# ─────────────────────────────────────────────────────────────────────────────
+
+_parser_local = threading.local()
+
+
+def _simdjson_parser() -> simdjson.Parser:
+    """Returns the simdjson parser of the calling thread (parsers are not shareable)."""
+    parser = getattr(_parser_local, "parser", None)
+    if parser is None:
+        parser = _parser_local.parser = simdjson.Parser()
+    return parser
+
+
+def _plain(value: Any) -> Any:
+    """Converts a simdjson proxy into regular Python objects."""
+    if isinstance(value, simdjson.Object):
+        return value.as_dict()
+    if isinstance(value, simdjson.Array):
+        return value.as_list()
+    return value
+
+
+def _summarize(raw: bytes) -> dict[str, Any]:
+    """Validates a snapshot and extracts only the small fields we log and serve.
+
+    Raises ValueError for invalid JSON. No simdjson proxy outlives this call,
+    so the thread's parser can be reused for the next document.
+    """
+    try:
+        doc = _simdjson_parser().parse(raw)
+    except RuntimeError as exc:
+        # simdjson reports some invalid input (e.g. BIGINT_ERROR) this way
+        raise ValueError(str(exc)) from None
+    if not isinstance(doc, simdjson.Object):
+        del doc  # The traceback must not keep the parser's document alive
+        raise ValueError("top-level value is not an object")
+    vehicles = doc.get("vehicles")
+    lines    = doc.get("lines")
+    stations = doc.get("stations")
+    return {
+        "keys":      len(doc),
+        "vehicles":  len(vehicles) if isinstance(vehicles, simdjson.Array) else 0,
+        "lines":     len(lines)    if isinstance(lines,    simdjson.Array) else 0,
+        "stations":  len(stations) if isinstance(stations, simdjson.Array) else 0,
+        "stats":     _plain(doc.get("stats", {})),
+        "game_time": _plain(doc.get("game_time")),
+        "timestamp": _plain(doc.get("timestamp")),
+    }
+
+
+def _with_timestamp(raw: bytes, timestamp: int, empty: bool) -> bytes:
+    """Appends a "timestamp" key to a JSON object without re-encoding it."""
+    body = memoryview(raw.rstrip())[:-1]  # drop the closing brace
+    sep  = b"" if empty else b","
+    return b"".join((body, b'%s"timestamp":%d}' % (sep, timestamp)))
+
+
+def _encode_branch(raw: bytes, key: str) -> bytes:
+    """Returns one top-level value of a snapshot as minified JSON bytes."""
+    doc = _simdjson_parser().parse(raw)
+    if key not in doc:
+        return b"[]"
+    value = doc[key]
+    if isinstance(value, (simdjson.Object, simdjson.Array)):
+        return value.mini
+    return orjson.dumps(value)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Data store (in-memory; snapshots are swapped, never mutated in place)
 # ─────────────────────────────────────────────────────────────────────────────
 
 class TelemetryStore:
-    """Holds the current telemetry state and notifies listeners."""
+    """Holds the current telemetry state and wakes up WebSocket handlers.
+
+    The snapshot is kept as raw JSON bytes; the dict form is only parsed
+    when an API endpoint actually asks for it.
+
+    orjson and simdjson hold the GIL while they parse, so a worker thread
+    would still stall the event loop. Validation and branch encoding run
+    in the *executor* process pool instead (set up by the app lifespan);
+    without one they run inline.
+    """
 
     def __init__(self) -> None:
-        self._data: dict[str, Any] = {}
-        self._lock = asyncio.Lock()
-        self._listeners: list[asyncio.Queue] = []
+        self._data_raw: bytes = b""
+        self._data_parsed: dict[str, Any] | None = None
+        self._summary: dict[str, Any] = {}
+        self._branches: dict[str, asyncio.Future[bytes]] = {}
+        self.executor: ProcessPoolExecutor | None = None
+        self._update_seq: int = 0
+        self._version: int = 0
+        self._new_frame: asyncio.Event | None = None
         self.last_update: float = 0.0
         self.file_mtime: float = 0.0
+        self.etag: str = ""
+        self._last_log: float = 0.0
+
+    async def update(self, raw: bytes, mtime: float) -> None:
+        """Stores a raw JSON snapshot and notifies all WebSocket clients.
 
-    async def update(self, raw: str) -> None:
-        """Parses a JSON string and notifies all WebSocket clients."""
+        *mtime* is the modification time of the file the bytes were read from;
+        it becomes the snapshot's ETag.
+        """
+        self._update_seq += 1
+        seq = self._update_seq
+
+        # simdjson validates the whole document (catching files that were
+        # read while the game was still writing) without building a dict.
         try:
-            data = json.loads(raw)
-        except json.JSONDecodeError as exc:
+            summary = await self._run_parser(_summarize, raw)
+        except ValueError as exc:
             log.warning("Invalid JSON: %s", exc)
             return
+        if seq != self._update_seq:
+            return  # A newer file read overtook this one
 
         # Inject a server-side Unix timestamp when the game doesn't supply one.
         # The TPF2 Lua sandbox has no os.time(), so write_count is used instead.
-        if not data.get("timestamp"):
-            data["timestamp"] = int(time.time())
+        # The key is spliced in before the closing brace so the document never
+        # has to be parsed and re-encoded (a later duplicate key wins).
+        if not summary["timestamp"]:
+            summary["timestamp"] = int(time.time())
+            raw = _with_timestamp(raw, summary["timestamp"], empty=summary["keys"] == 0)
+
+        # Plain attribute rebinds – readers on the event loop never see a
+        # half-updated snapshot, so no lock is needed.
+        self._data_raw = raw
+        self._data_parsed = None
+        self._summary = summary
+        self._branches = {}
+        now = time.time()
+        self.last_update = now
+        self.file_mtime = mtime
+        self.etag = f'W/"{int(mtime * 1000)}"'
+        self._version += 1
+
+        # Wake all waiting WebSocket handlers; each one picks up the latest
+        # frame itself, so slow clients simply skip intermediate snapshots.
+        if self._new_frame is not None:
+            self._new_frame.set()
+            self._new_frame.clear()
+
+        # At most one line per second, even if the game writes faster
+        if now - self._last_log >= 1.0 and log.isEnabledFor(logging.INFO):
+            self._last_log = now
+            log.info(
+                "Update: %d vehicles | %d lines | %d stations",
+                summary["vehicles"], summary["lines"], summary["stations"],
+            )
+
+    @property
+    def raw_bytes(self) -> bytes:
+        """The current snapshot as JSON bytes (timestamp already injected)."""
+        return self._data_raw
+
+    @property
+    def summary(self) -> dict[str, Any]:
+        """Counts, stats, game_time and timestamp of the current snapshot."""
+        return self._summary
+
+    async def _run_parser(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Runs a CPU-bound parse in the process pool, or inline without one."""
+        if self.executor is None:
+            return fn(*args)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+        except BrokenProcessPool:
+            log.warning("Parser process died – parsing in the server process from now on")
+            self.executor = None
+            return fn(*args)
+
+    async def get(self) -> Mapping[str, Any]:
+        """Returns the parsed snapshot as a read-only view of the shared dict.
+
+        No copy is made; nested lists/dicts are shared too, which is safe as
+        nothing in the server mutates them. The parse runs once per snapshot
+        on the event loop: handing a dict over from the pool would cost more
+        than parsing it here, so the endpoints use get_branch() instead.
+        """
+        if self._data_parsed is None:
+            try:
+                self._data_parsed = orjson.loads(self._data_raw) if self._data_raw else {}
+            except orjson.JSONDecodeError as exc:
+                log.warning("Invalid JSON: %s", exc)
+                self._data_parsed = {}
+        return MappingProxyType(self._data_parsed)
+
+    async def get_branch(self, key: str) -> tuple[bytes, str]:
+        """Returns one top-level branch (e.g. "vehicles") as JSON bytes.
+
+        Each branch is encoded once per snapshot in the parser pool and
+        then served from cache; concurrent requests share that one job.
+        The ETag of the snapshot the bytes were built from is returned too,
+        as update() may replace the snapshot while the branch is encoded.
+        """
+        etag = self.etag
+        if not self._data_raw:
+            return b"[]", etag
+        branches = self._branches  # replaced (not cleared) by update()
+        task = branches.get(key)
+        if task is None:
+            task = branches[key] = asyncio.ensure_future(
+                self._run_parser(_encode_branch, self._data_raw, key)
+            )
+        try:
+            # Shielded: one cancelled request must not cancel the shared job
+            return await asyncio.shield(task), etag
+        except Exception:
+            if branches.get(key) is task:
+                del branches[key]  # Let the next request try again
+            raise
 
-        broadcast_raw = json.dumps(data, separators=(",", ":"))
+    async def next_frame(self, last_seen: int) -> tuple[int, bytes]:
+        """Waits for a snapshot newer than version *last_seen* and returns it."""
+        while self._version == last_seen:
+            if self._new_frame is None:
+                self._new_frame = asyncio.Event()
+            await self._new_frame.wait()
+        return self._version, self._data_raw
 
-        async with self._lock:
-            self._data = data
-            self.last_update = time.time()
 
-        # Fill all waiting queues (WebSocket handlers)
-        for q in list(self._listeners):
-            try:
-                q.put_nowait(broadcast_raw)
-            except asyncio.QueueFull:
-                pass  # Client too slow – skip current frame
-
-        log.info(
-            "Update: %d vehicles | %d lines | %d stations",
-            len(data.get("vehicles", [])),
-            len(data.get("lines",    [])),
-            len(data.get("stations", [])),
-        )
+store = TelemetryStore()
 
-    async def get(self) -> dict[str, Any]:
-        async with self._lock:
-            return dict(self._data)
+# ─────────────────────────────────────────────────────────────────────────────
+# File watching: inotify (Linux) or watchdog (everywhere else)
+# ─────────────────────────────────────────────────────────────────────────────
 
-    def subscribe(self) -> asyncio.Queue:
-        q: asyncio.Queue = asyncio.Queue(maxsize=4)
-        self._listeners.append(q)
-        return q
+def _read_snapshot(path: Path) -> tuple[bytes, float]:
+    """Reads the file and the mtime belonging to exactly these bytes."""
+    with path.open("rb") as f:
+        # stat before reading: a write racing the read can only make the
+        # tag older than the content, and the next event then reloads it
+        mtime = os.fstat(f.fileno()).st_mtime
+        return f.read(), mtime
 
-    def unsubscribe(self, q: asyncio.Queue) -> None:
-        try:
-            self._listeners.remove(q)
-        except ValueError:
-            pass
 
+async def load_telemetry(path: Path) -> None:
+    """Reads telemetry.json once and updates the store.
 
-store = TelemetryStore()
+    The file is read as raw bytes (no UTF-8 decode, the parsers take bytes)
+    in a worker thread so large snapshots don't block the event loop.
+
+    The file is deliberately not mmap'ed: the mod rewrites telemetry.json in
+    place (truncate + write, no atomic rename), which can SIGBUS a mapping on
+    Linux and makes the game's truncate fail on Windows while it is mapped.
+    The bytes are kept as the broadcast frame anyway, so a copy is needed.
+    """
+    try:
+        content, mtime = await asyncio.to_thread(_read_snapshot, path)
+        if content.strip():
+            await store.update(content, mtime)
+    except OSError as exc:
+        log.debug("File read error (ignored): %s", exc)
+    except Exception as exc:
+        # One bad snapshot must not end the watch loop / reload task
+        log.warning("Reload of %s failed: %s", path.name, exc)
+
+
+async def watch_inotify(path: Path) -> None:
+    """Reloads telemetry.json after every completed write.
+
+    CLOSE_WRITE only fires once the game has closed the file, so no settle
+    delay is needed; MOVED_TO covers writers that rename a temp file into place.
+    """
+    with Inotify() as inotify:
+        inotify.add_watch(path.parent, Mask.CLOSE_WRITE | Mask.MOVED_TO)
+        log.info("Watching: %s (inotify)", path)
+
+        if path.exists():
+            await load_telemetry(path)
+
+        async for event in inotify:
+            if event.path == path:
+                await load_telemetry(path)
 
-# ─────────────────────────────────────────────────────────────────────────────
-# Watchdog: watch file for changes
-# ─────────────────────────────────────────────────────────────────────────────
 
 class TelemetryFileHandler(FileSystemEventHandler):
-    """Reacts to changes in telemetry.json."""
+    """Reacts to changes in telemetry.json.
+
+    The game triggers several modify events per write; they are coalesced so
+    that only one reload runs at a time and it always reads the latest file.
+    """
 
     def __init__(self, path: Path, loop: asyncio.AbstractEventLoop) -> None:
         self._path = path.resolve()
+        self._path_str = str(self._path)
         self._loop = loop
+        self._dirty = False
+        self._reload_task: asyncio.Task | None = None
 
     def on_modified(self, event: FileModifiedEvent) -> None:
-        if Path(event.src_path).resolve() != self._path:
+        # Cheap string checks first; realpath() costs a syscall and is only
+        # needed when the name matches but the spelling of the path doesn't
+        src = event.src_path
+        if os.path.basename(src) != self._path.name:
+            return
+        if src != self._path_str and os.path.realpath(src) != self._path_str:
             return
-        # Read file asynchronously (in the asyncio thread)
-        asyncio.run_coroutine_threadsafe(self._reload(), self._loop)
+        # Only flag the change here (observer thread); the asyncio thread
+        # decides whether a reload has to be started
+        self._loop.call_soon_threadsafe(self._mark_dirty)
+
+    def _mark_dirty(self) -> None:
+        self._dirty = True
+        if self._reload_task is None or self._reload_task.done():
+            self._reload_task = self._loop.create_task(self._reload())
 
     async def _reload(self) -> None:
         """Reads telemetry.json and updates the store."""
-        try:
-            mtime = self._path.stat().st_mtime
-            if mtime == store.file_mtime:
-                return  # No real change
-            store.file_mtime = mtime
-
-            # Wait briefly in case the file is still being written
+        while self._dirty:
+            # Wait briefly in case the file is still being written; events
+            # arriving meanwhile are folded into this read
             await asyncio.sleep(0.05)
+            self._dirty = False
+            try:
+                if self._path.stat().st_mtime == store.file_mtime:
+                    continue  # No real change
+            except OSError as exc:
+                log.debug("File read error (ignored): %s", exc)
+                continue
+            await load_telemetry(self._path)
+
+
+OBSERVER_RESTART_DELAY = 5.0  # seconds
+
+
+def _start_observer(handler: TelemetryFileHandler, watch_dir: Path) -> Observer:
+    # Threads can't be restarted, so every (re)start needs a fresh observer
+    observer = Observer()
+    observer.schedule(handler, str(watch_dir), recursive=False)
+    observer.start()
+    return observer
+
+
+def _observer_exited(observer: Observer, loop: asyncio.AbstractEventLoop) -> asyncio.Future:
+    """Returns a future that resolves once the observer thread has stopped."""
+    exited = loop.create_future()
+
+    def join() -> None:
+        observer.join()
+        try:
+            loop.call_soon_threadsafe(lambda: exited.done() or exited.set_result(None))
+        except RuntimeError:
+            pass  # Event loop already closed (server shutdown)
 
-            content = self._path.read_text(encoding="utf-8")
-            if not content.strip():
-                return
-            await store.update(content)
-        except (OSError, PermissionError) as exc:
-            log.debug("File read error (ignored): %s", exc)
+    threading.Thread(target=join, name="watchdog-join", daemon=True).start()
+    return exited
 
 
 async def start_watchdog(loop: asyncio.AbstractEventLoop) -> None:
-    """Starts the watchdog observer in a separate thread."""
+    """Watches telemetry.json via inotify, or a watchdog observer thread."""
     watch_dir = TELEMETRY_PATH.parent
     if not watch_dir.exists():
         log.warning("Watch directory does not exist: %s", watch_dir)
         return
 
+    if Inotify is not None:
+        await watch_inotify(TELEMETRY_PATH.resolve())
+        return
+
     handler  = TelemetryFileHandler(TELEMETRY_PATH, loop)
-    observer = Observer()
-    observer.schedule(handler, str(watch_dir), recursive=False)
-    observer.start()
+    observer = _start_observer(handler, watch_dir)
     log.info("Watching: %s", TELEMETRY_PATH)
 
     # Initial read on startup
     if TELEMETRY_PATH.exists():
-        try:
-            content = TELEMETRY_PATH.read_text(encoding="utf-8")
-            if content.strip():
-                await store.update(content)
-        except OSError:
-            pass
+        await load_telemetry(TELEMETRY_PATH)
 
-    # Observer runs in the background – just wait for shutdown here
+    # Observer runs in the background – sleep until its thread exits
     try:
         while True:
-            await asyncio.sleep(1)
-            if not observer.is_alive():
-                log.warning("Watchdog observer died – restarting")
-                observer.start()
+            await _observer_exited(observer, loop)
+            log.warning("Watchdog observer died – restarting in %g s", OBSERVER_RESTART_DELAY)
+            # Throttled, so an observer that dies right away can't spin
+            await asyncio.sleep(OBSERVER_RESTART_DELAY)
+            observer = _start_observer(handler, watch_dir)
     finally:
         observer.stop()
         observer.join()
@@ -202,12 +471,30 @@ async def start_watchdog(loop: asyncio.AbstractEventLoop) -> None:
 
 APP_VERSION = "1.1.0"
 
+class OrjsonResponse(JSONResponse):
+    """JSONResponse that serializes through orjson instead of stdlib json."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     loop = asyncio.get_running_loop()
+    if PARSE_WORKERS > 0:
+        # "spawn" everywhere: never fork a process that already runs threads
+        store.executor = ProcessPoolExecutor(
+            max_workers = PARSE_WORKERS,
+            mp_context  = multiprocessing.get_context("spawn"),
+        )
     asyncio.create_task(start_watchdog(loop))
     log.info("Server started on http://%s:%d", HOST, PORT)
-    yield
+    try:
+        yield
+    finally:
+        if store.executor is not None:
+            store.executor.shutdown(wait=False, cancel_futures=True)
+            store.executor = None
 
 
 app = FastAPI(
@@ -215,6 +502,7 @@ app = FastAPI(
     description = "Shows live data of all trains from Transport Fever 2",
     version     = APP_VERSION,
     lifespan    = lifespan,
+    default_response_class = OrjsonResponse,
     websocket_max_size = None if WS_MAX_SIZE == 0 else WS_MAX_SIZE,
 )
 
@@ -234,6 +522,33 @@ if _static_dir.exists():
 
 # ─── REST endpoints ──────────────────────────────────────────────────────────
 
+def _cache_headers(etag: str) -> dict[str, str]:
+    if not etag:
+        return {}
+    return {"ETag": etag, "Cache-Control": "no-cache"}
+
+
+def _not_modified(request: Request) -> Response | None:
+    """Returns a 304 response when the client already has the current snapshot."""
+    header = request.headers.get("if-none-match")
+    if not store.etag or header is None:
+        return None
+    if header.strip() != "*" and store.etag not in (t.strip() for t in header.split(",")):
+        return None
+    return Response(status_code=304, headers=_cache_headers(store.etag))
+
+
+def _snapshot_json(content: bytes, etag: str | None = None) -> Response:
+    """JSON response tagged with *etag*, by default that of the current snapshot.
+
+    Pass the tag explicitly when *content* was produced across an await, so
+    an update in between can't label old bytes with the new snapshot's tag.
+    """
+    if etag is None:
+        etag = store.etag
+    return Response(content=content, media_type="application/json", headers=_cache_headers(etag))
+
+
 @app.get("/", response_class=HTMLResponse)
 async def root() -> HTMLResponse:
     """Serves the main web UI."""
@@ -243,56 +558,71 @@ async def root() -> HTMLResponse:
     return HTMLResponse("<h1>TPF2 Telemetry</h1><p>static/index.html not found.</p>")
 
 
-@app.get("/api/telemetry", response_class=JSONResponse)
-async def api_telemetry() -> JSONResponse:
+@app.get("/api/telemetry")
+async def api_telemetry(request: Request) -> Response:
     """Returns the current telemetry snapshot as JSON."""
-    data = await store.get()
-    return JSONResponse(content=data)
+    not_modified = _not_modified(request)
+    if not_modified is not None:
+        return not_modified
+    # Served straight from the broadcast bytes – no parse, no re-encode
+    return _snapshot_json(store.raw_bytes or b"{}")
 
 
-@app.get("/api/vehicles", response_class=JSONResponse)
-async def api_vehicles() -> JSONResponse:
+@app.get("/api/vehicles")
+async def api_vehicles(request: Request) -> Response:
     """Returns only the vehicle list."""
-    data = await store.get()
-    return JSONResponse(content=data.get("vehicles", []))
+    not_modified = _not_modified(request)
+    if not_modified is not None:
+        return not_modified
+    content, etag = await store.get_branch("vehicles")
+    return _snapshot_json(content, etag)
 
 
-@app.get("/api/lines", response_class=JSONResponse)
-async def api_lines() -> JSONResponse:
+@app.get("/api/lines")
+async def api_lines(request: Request) -> Response:
     """Returns all lines."""
-    data = await store.get()
-    return JSONResponse(content=data.get("lines", []))
+    not_modified = _not_modified(request)
+    if not_modified is not None:
+        return not_modified
+    content, etag = await store.get_branch("lines")
+    return _snapshot_json(content, etag)
 
 
-@app.get("/api/stations", response_class=JSONResponse)
-async def api_stations() -> JSONResponse:
+@app.get("/api/stations")
+async def api_stations(request: Request) -> Response:
     """Returns all stations."""
-    data = await store.get()
-    return JSONResponse(content=data.get("stations", []))
+    not_modified = _not_modified(request)
+    if not_modified is not None:
+        return not_modified
+    content, etag = await store.get_branch("stations")
+    return _snapshot_json(content, etag)
 
 
-@app.get("/api/stats", response_class=JSONResponse)
-async def api_stats() -> JSONResponse:
+@app.get("/api/stats")
+async def api_stats(request: Request) -> Response:
     """Returns summary statistics."""
-    data = await store.get()
-    return JSONResponse(content={
-        "stats":       data.get("stats", {}),
+    not_modified = _not_modified(request)
+    if not_modified is not None:
+        return not_modified
+    summary = store.summary
+    return _snapshot_json(orjson.dumps({
+        "stats":       summary.get("stats", {}),
         "last_update": store.last_update,
-        "game_time":   data.get("game_time"),
-        "timestamp":   data.get("timestamp"),
-    })
+        "game_time":   summary.get("game_time"),
+        "timestamp":   summary.get("timestamp"),
+    }))
 
 
-@app.get("/api/health", response_class=JSONResponse)
-async def api_health() -> JSONResponse:
+@app.get("/api/health", response_model=None)
+async def api_health() -> dict[str, Any]:
     """Health-check endpoint."""
     age = time.time() - store.last_update if store.last_update else None
-    return JSONResponse(content={
+    return {
         "status":         "ok",
         "telemetry_path": str(TELEMETRY_PATH),
         "file_exists":    TELEMETRY_PATH.exists(),
         "last_update_age_seconds": round(age, 1) if age is not None else None,
-    })
+    }
 
 
 # ─── WebSocket ───────────────────────────────────────────────────────────────
@@ -301,39 +631,43 @@ async def api_health() -> JSONResponse:
 async def websocket_endpoint(ws: WebSocket) -> None:
     """
     WebSocket connection for live updates.
-    Sends the full snapshot on every telemetry.json change.
+    Sends the full snapshot on every telemetry.json change as a binary frame
+    containing UTF-8 JSON (the same bytes for every client).
     """
     await ws.accept()
     log.info("WebSocket connected: %s", ws.client)
 
-    queue = store.subscribe()
-
-    # Send current state immediately
-    current = await store.get()
-    if current:
-        try:
-            await ws.send_text(json.dumps(current))
-        except Exception:
-            pass
-
+    # Keepalive is handled by uvicorn's protocol-level pings. The client never
+    # sends anything, but receiving is the only way to notice a closed tab
+    # while no new snapshots arrive, so both directions run side by side.
+    sender   = asyncio.create_task(_send_frames(ws))
+    receiver = asyncio.create_task(_wait_for_disconnect(ws))
     try:
-        while True:
-            try:
-                # Wait for the next update (30 s timeout for keepalive)
-                raw = await asyncio.wait_for(queue.get(), timeout=30.0)
-                await ws.send_text(raw)
-            except asyncio.TimeoutError:
-                # Keepalive ping
-                try:
-                    await ws.send_text(json.dumps({"type": "ping", "ts": time.time()}))
-                except Exception:
-                    break
-    except WebSocketDisconnect:
+        done, _ = await asyncio.wait({sender, receiver}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        sender.cancel()
+        receiver.cancel()
+
+    exc = next(iter(done)).exception()
+    if exc is None or isinstance(exc, WebSocketDisconnect):
         log.info("WebSocket disconnected: %s", ws.client)
-    except Exception as exc:
+    else:
         log.debug("WebSocket error: %s", exc)
-    finally:
-        store.unsubscribe(queue)
+
+
+async def _send_frames(ws: WebSocket) -> None:
+    # Version 0 is the empty store, so an existing snapshot is sent immediately
+    version = 0
+    while True:
+        version, frame = await store.next_frame(version)
+        await ws.send_bytes(frame)
+
+
+async def _wait_for_disconnect(ws: WebSocket) -> None:
+    while True:
+        message = await ws.receive()
+        if message["type"] == "websocket.disconnect":
+            return
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -346,6 +680,7 @@ if __name__ == "__main__":
     log.info("  Telemetry file : %s", TELEMETRY_PATH)
     log.info("  Web interface  : http://%s:%d", HOST, PORT)
     log.info("  API docs       : http://%s:%d/docs", HOST, PORT)
+    log.info("  Workers        : %d (loop=%s, http=%s)", WORKERS, LOOP, HTTP)
     log.info("═" * 60)
 
     uvicorn.run(
@@ -354,5 +689,11 @@ if __name__ == "__main__":
         port      = PORT,
         log_level = LOG_LEVEL,
         reload    = False,
+        loop      = LOOP,
+        http      = HTTP,
+        workers   = WORKERS,
         ws_max_size = None if WS_MAX_SIZE == 0 else WS_MAX_SIZE,
+        # Every client gets the same pre-encoded frame; per-message deflate
+        # would compress it again for each connection.
+        ws_per_message_deflate = False,
     )
@@ -218,6 +218,7 @@ window.tpf2T = t;
 // ─── App config ───────────────────────────────────────────────────────────────
 const WS_URL             = `ws://${location.host}/ws`;
 const RECONNECT_DELAY_MS = 3000;
+const WS_DECODER         = new TextDecoder();
 
 // ─── State ────────────────────────────────────────────────────────────────────
 let _state = { vehicles: [], lines: [], stations: [], stats: {}, game_time: null, timestamp: null, paths: [], signals: [], tracks: [] };
@@ -1433,6 +1434,7 @@ function connectWS() {
   if (_ws && _ws.readyState <= 1) return;
   setConnState("connecting");
   _ws = new WebSocket(WS_URL);
+  _ws.binaryType = "arraybuffer"; // server sends UTF-8 JSON as binary frames
 
   _ws.onopen = () => {
     setConnState("connected");
@@ -1441,9 +1443,8 @@ function connectWS() {
 
   _ws.onmessage = evt => {
     try {
-      const data = JSON.parse(evt.data);
-      if (data.type === "ping") return;
-      handleTelemetryData(data);
+      const text = typeof evt.data === "string" ? evt.data : WS_DECODER.decode(evt.data);
+      handleTelemetryData(JSON.parse(text));
     } catch (e) { console.warn("WebSocket parse error:", e); }
   };
 